@@ -2,6 +2,7 @@
 Main lolrus application using DearPyGui.
 """
 
+import hashlib
 import os
 import sys
 from collections.abc import Callable
@@ -24,6 +25,9 @@ from lolrus import __version__
 from lolrus.connections import COMMON_ENDPOINTS, Connection, ConnectionManager
 from lolrus.s3_client import AsyncOperation, OperationStatus, S3Client, S3Object
 
+# Operations still worth tracking in the render loop
+_IN_FLIGHT_STATUSES = (OperationStatus.PENDING, OperationStatus.RUNNING)
+
 
 class LolrusApp:
     """Main application class for lolrus S3 browser."""
@@ -120,8 +124,8 @@ class LolrusApp:
             dpg.render_dearpygui_frame()
 
         # Cleanup
-        if self.s3_client:
-            self.s3_client.close()
+        self.connection_manager.close()
+        self.connection_manager.clear_credentials_cache()
         dpg.destroy_context()
 
     def _set_viewport_icon(self):
@@ -450,8 +454,11 @@ class LolrusApp:
         if not self.active_operations:
             return
 
+        # Runs every frame: bind the enum member once instead of per-op attribute lookups
+        running = OperationStatus.RUNNING
+
         # Update progress for active operations
-        active = [op for op in self.active_operations if op.status == OperationStatus.RUNNING]
+        active = [op for op in self.active_operations if op.status is running]
         if active:
             op = active[0]
             dpg.configure_item(self.TAG_PROGRESS_BAR, show=True)
@@ -462,7 +469,7 @@ class LolrusApp:
             dpg.set_value(self.TAG_PROGRESS_TEXT, "")
 
         # Clean up completed operations
-        self.active_operations = [op for op in self.active_operations if op.status in (OperationStatus.PENDING, OperationStatus.RUNNING)]
+        self.active_operations = [op for op in self.active_operations if op.status in _IN_FLIGHT_STATUSES]
 
     def _on_connection_selected(self, sender, app_data):
         """Handle connection selection."""
@@ -477,21 +484,13 @@ class LolrusApp:
 
         self._set_status(f"Connecting to {conn.endpoint_url}...")
 
-        # Close existing client
-        if self.s3_client:
-            self.s3_client.close()
-
         try:
-            self.s3_client = S3Client(
-                endpoint_url=conn.endpoint_url,
-                access_key=conn.access_key,
-                secret_key=conn.secret_key,
-                region=conn.region,
-                log_callback=self._add_log,
-            )
+            # Clients are pooled per connection, so switching back reuses open connections
+            self.s3_client = self.connection_manager.get_client(connection_name, log_callback=self._add_log)
 
             if not self.s3_client.test_connection():
                 self._set_status("Connection failed - check credentials")
+                self.connection_manager.close_client(connection_name)
                 self.s3_client = None
                 return
 
@@ -509,6 +508,8 @@ class LolrusApp:
 
         except Exception as e:
             self._set_status(f"Connection error: {e}")
+            # Don't leave a broken client pooled for the next selection to reuse
+            self.connection_manager.close_client(connection_name)
             self.s3_client = None
 
     def _on_bucket_selected(self, sender, app_data):
@@ -951,8 +952,7 @@ class LolrusApp:
 
     def _make_selectable_tag(self, key: str) -> str:
         """Create a valid DearPyGui tag from an object key."""
-        import hashlib
-        return f"obj_{hashlib.md5(key.encode()).hexdigest()[:12]}"
+        return f"obj_{hashlib.blake2b(key.encode(), digest_size=6).hexdigest()}"
 
     def _copy_to_clipboard(self, text: str):
         """Copy text to clipboard using tkinter."""
@@ -1348,6 +1348,11 @@ class LolrusApp:
         if old_name and old_name != name:
             self.connection_manager.delete_connection(old_name)
 
+            # Clear current connection if it was renamed (the manager closed its client)
+            if self.current_connection and self.current_connection.name == old_name:
+                self.current_connection = None
+                self.s3_client = None
+
         conn = Connection(
             name=name,
             endpoint_url=endpoint,
@@ -1378,12 +1383,10 @@ class LolrusApp:
         self.connection_manager.delete_connection(name)
         self._update_connection_combo()
 
-        # Clear current connection if it was deleted
+        # Clear current connection if it was deleted (the manager closed its client)
         if self.current_connection and self.current_connection.name == name:
             self.current_connection = None
-            if self.s3_client:
-                self.s3_client.close()
-                self.s3_client = None
+            self.s3_client = None
 
         self._set_status(f"Connection '{name}' deleted")
 
@@ -5,17 +5,53 @@ Uses the system keyring to store secrets securely.
 """
 
 import contextlib
-import json
+import hashlib
+import io
+import os
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
 import keyring
+import orjson
+
+from lolrus.s3_client import S3Client
 
 APP_NAME = "lolrus"
 KEYRING_SERVICE = "lolrus-s3-browser"
 
+# Keyring field holding both credentials as one JSON entry
+CREDENTIALS_FIELD = "creds"
+# Per-field keyring entries written by earlier versions
+LEGACY_CREDENTIAL_FIELDS = ("access_key", "secret_key")
+
+
+def _keyring_key(connection_name: str, field: str) -> str:
+    """Generate a keyring key for a connection's credential field."""
+    return f"{connection_name}:{field}"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write data to path atomically.
 
-@dataclass
+    The bytes go to a sibling temp file in one buffered write, are fsynced,
+    and then renamed over the target, so a crash never leaves a half-written file.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    try:
+        with open(tmp_path, "wb", buffering=io.DEFAULT_BUFFER_SIZE * 16) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+@dataclass(slots=True)
 class Connection:
     """A saved S3 connection."""
 
@@ -68,34 +104,122 @@ class ConnectionManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.connections_file = self.config_dir / "connections.json"
 
+        # Parsed on first access by _ensure_loaded(), not here
         self._connections: dict[str, Connection] = {}
-        self._load()
+        self._loaded = False
+        # Digest of the last payload written, to skip rewriting identical content
+        self._last_payload_digest: bytes | None = None
+        # (access_key, secret_key) by connection name, so repeat lookups skip the OS keyring
+        self._cred_cache: dict[str, tuple[str, str]] = {}
+        # Names known to have no legacy per-field keyring entries, so saves and
+        # deletes can skip cleaning them up
+        self._migrated: set[str] = set()
+        # Open clients by connection name, with the settings they were built from
+        self._clients: dict[str, tuple[tuple[str, str, str, str], S3Client]] = {}
+
+    def _ensure_loaded(self) -> None:
+        """Load connections from disk the first time they are needed."""
+        if not self._loaded:
+            self._load()
+            self._loaded = True
 
     def _load(self) -> None:
         """Load connections from disk."""
         if self.connections_file.exists():
             try:
-                with open(self.connections_file) as f:
-                    data = json.load(f)
-                    for conn_data in data.get("connections", []):
-                        conn = Connection.from_dict(conn_data)
-                        self._connections[conn.name] = conn
-            except (json.JSONDecodeError, KeyError):
+                data = orjson.loads(self.connections_file.read_bytes())
+                for conn_data in data.get("connections", []):
+                    conn = Connection.from_dict(conn_data)
+                    self._connections[conn.name] = conn
+            except (orjson.JSONDecodeError, KeyError):
                 # Corrupted file, start fresh
                 self._connections = {}
 
     def _save(self) -> None:
         """Save connections to disk."""
         data = {"connections": [c.to_dict() for c in self._connections.values()]}
-        with open(self.connections_file, "w") as f:
-            json.dump(data, f, indent=2)
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+        # Re-saving an unchanged connection shouldn't cost a write + fsync
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._last_payload_digest:
+            return
 
-    def _keyring_key(self, connection_name: str, field: str) -> str:
-        """Generate a keyring key for a connection's credential field."""
-        return f"{connection_name}:{field}"
+        _atomic_write(self.connections_file, payload)
+        self._last_payload_digest = digest
+
+    def _load_credentials(self, name: str) -> tuple[str, str]:
+        """
+        Load (access_key, secret_key) for a connection from keyring.
+
+        Reads the combined entry with a single keyring call, falling back to
+        the legacy per-field entries for connections saved by older versions.
+        Results are cached for the lifetime of the manager.
+        """
+        cached = self._cred_cache.get(name)
+        if cached is not None:
+            return cached
+
+        creds = self._read_keyring_credentials(name)
+        if any(creds):
+            self._cred_cache[name] = creds
+        return creds
+
+    def _read_keyring_credentials(self, name: str) -> tuple[str, str]:
+        """
+        Read (access_key, secret_key) for a connection directly from keyring.
+
+        Credentials found only in the legacy per-field entries are migrated to
+        the combined entry, and the legacy entries are deleted.
+        """
+        stored = keyring.get_password(KEYRING_SERVICE, _keyring_key(name, CREDENTIALS_FIELD))
+        if stored:
+            try:
+                creds = orjson.loads(stored)
+                self._migrated.add(name)
+                return creds.get("access_key", ""), creds.get("secret_key", "")
+            except (orjson.JSONDecodeError, AttributeError):
+                pass
+
+        access_key = keyring.get_password(KEYRING_SERVICE, _keyring_key(name, "access_key")) or ""
+        secret_key = keyring.get_password(KEYRING_SERVICE, _keyring_key(name, "secret_key")) or ""
+        if access_key or secret_key:
+            self._store_credentials(name, access_key, secret_key)
+            self._delete_keyring_entries(name, LEGACY_CREDENTIAL_FIELDS)
+        self._migrated.add(name)
+        return access_key, secret_key
+
+    def _store_credentials(self, name: str, access_key: str, secret_key: str) -> None:
+        """Store both credentials for a connection in a single keyring entry."""
+        keyring.set_password(
+            KEYRING_SERVICE,
+            _keyring_key(name, CREDENTIALS_FIELD),
+            orjson.dumps({"access_key": access_key, "secret_key": secret_key}).decode(),
+        )
+        self._cred_cache[name] = (access_key, secret_key)
+
+    def _delete_credentials(self, name: str) -> None:
+        """Remove a connection's credentials, including legacy per-field entries unless already migrated."""
+        self._cred_cache.pop(name, None)
+        if name in self._migrated:
+            self._migrated.discard(name)
+            self._delete_keyring_entries(name, (CREDENTIALS_FIELD,))
+        else:
+            self._delete_keyring_entries(name, (CREDENTIALS_FIELD, *LEGACY_CREDENTIAL_FIELDS))
+
+    def _delete_keyring_entries(self, name: str, fields: tuple[str, ...]) -> None:
+        """Delete a connection's keyring entries for the given fields, skipping ones that don't exist."""
+        for field in fields:
+            with contextlib.suppress(keyring.errors.PasswordDeleteError):
+                keyring.delete_password(KEYRING_SERVICE, _keyring_key(name, field))
+
+    def clear_credentials_cache(self) -> None:
+        """Forget credentials cached in memory; the next lookup goes back to keyring."""
+        self._cred_cache.clear()
 
     def list_connections(self) -> list[Connection]:
         """List all saved connections (without credentials loaded)."""
+        self._ensure_loaded()
         return list(self._connections.values())
 
     def get_connection(self, name: str, load_credentials: bool = True) -> Connection | None:
@@ -109,14 +233,14 @@ class ConnectionManager:
         Returns:
             Connection or None if not found
         """
+        self._ensure_loaded()
+
         conn = self._connections.get(name)
         if conn is None:
             return None
 
         if load_credentials:
-            # Load credentials from keyring
-            access_key = keyring.get_password(KEYRING_SERVICE, self._keyring_key(name, "access_key"))
-            secret_key = keyring.get_password(KEYRING_SERVICE, self._keyring_key(name, "secret_key"))
+            access_key, secret_key = self._load_credentials(name)
 
             # Return a copy with credentials populated
             return Connection(
@@ -138,19 +262,16 @@ class ConnectionManager:
         Args:
             connection: Connection to save (must have credentials populated)
         """
-        # Store credentials in keyring
-        if connection.access_key:
-            keyring.set_password(
-                KEYRING_SERVICE,
-                self._keyring_key(connection.name, "access_key"),
-                connection.access_key,
-            )
-        if connection.secret_key:
-            keyring.set_password(
-                KEYRING_SERVICE,
-                self._keyring_key(connection.name, "secret_key"),
-                connection.secret_key,
-            )
+        self._ensure_loaded()
+
+        access_key, secret_key = connection.access_key, connection.secret_key
+        if access_key or secret_key:
+            if not (access_key and secret_key):
+                # A blank field keeps its stored value, as with per-field entries
+                stored_access, stored_secret = self._load_credentials(connection.name)
+                access_key = access_key or stored_access
+                secret_key = secret_key or stored_secret
+            self._store_credentials(connection.name, access_key, secret_key)
 
         # Store metadata (without credentials)
         self._connections[connection.name] = Connection(
@@ -170,14 +291,13 @@ class ConnectionManager:
         Returns:
             True if deleted, False if not found
         """
+        self._ensure_loaded()
+
         if name not in self._connections:
             return False
 
-        # Remove from keyring
-        with contextlib.suppress(keyring.errors.PasswordDeleteError):
-            keyring.delete_password(KEYRING_SERVICE, self._keyring_key(name, "access_key"))
-        with contextlib.suppress(keyring.errors.PasswordDeleteError):
-            keyring.delete_password(KEYRING_SERVICE, self._keyring_key(name, "secret_key"))
+        self._delete_credentials(name)
+        self.close_client(name)
 
         # Remove from storage
         del self._connections[name]
@@ -195,22 +315,73 @@ class ConnectionManager:
         Returns:
             True if renamed, False if old_name not found or new_name exists
         """
-        if old_name not in self._connections or new_name in self._connections:
-            return False
+        self._ensure_loaded()
 
-        # Get full connection with credentials
-        conn = self.get_connection(old_name, load_credentials=True)
-        if conn is None:
+        if old_name not in self._connections or new_name in self._connections:
             return False
 
-        # Save with new name
-        conn.name = new_name
-        self.save_connection(conn)
+        # Move credentials to the new keyring entry
+        access_key, secret_key = self._load_credentials(old_name)
+        if access_key or secret_key:
+            self._store_credentials(new_name, access_key, secret_key)
+        self._delete_credentials(old_name)
+        self.close_client(old_name)
 
-        # Delete old
-        self.delete_connection(old_name)
+        # Re-key the metadata and write the file once
+        conn = self._connections.pop(old_name)
+        self._connections[new_name] = Connection(name=new_name, endpoint_url=conn.endpoint_url, region=conn.region)
+        self._save()
         return True
 
+    def get_client(self, name: str, log_callback: Callable[[str, str], None] | None = None) -> S3Client | None:
+        """
+        Get an S3 client for a connection, reusing an open one when possible.
+
+        Reusing the client keeps its HTTP connection pool (and TLS sessions)
+        alive across reconnects. A new client is built if the connection's
+        endpoint, region or credentials have changed since the last call.
+
+        Args:
+            name: Connection name
+            log_callback: Logging callback passed to a newly created client
+
+        Returns:
+            S3Client or None if the connection is not found
+        """
+        conn = self.get_connection(name, load_credentials=True)
+        if conn is None:
+            return None
+
+        settings = (conn.endpoint_url, conn.region, conn.access_key, conn.secret_key)
+        cached = self._clients.get(name)
+        if cached is not None:
+            cached_settings, client = cached
+            if cached_settings == settings:
+                return client
+            client.close()
+
+        client = S3Client(
+            endpoint_url=conn.endpoint_url,
+            access_key=conn.access_key,
+            secret_key=conn.secret_key,
+            region=conn.region,
+            log_callback=log_callback,
+        )
+        self._clients[name] = (settings, client)
+        return client
+
+    def close_client(self, name: str) -> None:
+        """Close and forget the pooled client for a connection, if any."""
+        cached = self._clients.pop(name, None)
+        if cached is not None:
+            cached[1].close()
+
+    def close(self) -> None:
+        """Close all pooled clients."""
+        for _, client in self._clients.values():
+            client.close()
+        self._clients.clear()
+
 
 # Common S3-compatible endpoints for quick setup
 COMMON_ENDPOINTS = {
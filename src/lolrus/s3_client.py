@@ -4,16 +4,37 @@ S3 client wrapper with async operations.
 All S3 operations run in a thread pool to keep the UI responsive.
 """
 
+import contextlib
+import os
 import threading
-from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
-import boto3
-from botocore.config import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Maximum keys S3 returns per ListObjectsV2 page
+LIST_PAGE_SIZE = 1000
+
+# Maximum keys accepted by a single DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
+# Chunk size when streaming an object body to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Thread pool sizing for async operations
+POOL_SIZE_ENV = "LOLRUS_S3_POOL"
+MIN_POOL_SIZE = 4
+MAX_POOL_SIZE = 32
+
+# Downloads stream into local_path + this suffix and are renamed into place on success
+PARTIAL_DOWNLOAD_SUFFIX = ".part"
+
+# Minimum seconds between on_progress calls during a transfer (20Hz)
+PROGRESS_INTERVAL = 0.05
 
 
 class OperationStatus(Enum):
@@ -26,7 +47,7 @@ class OperationStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class S3Object:
     """Represents an object in S3."""
 
@@ -36,18 +57,17 @@ class S3Object:
     etag: str
     storage_class: str = "STANDARD"
 
-    @property
-    def name(self) -> str:
-        """Get the object name (last part of key)."""
-        return self.key.rstrip("/").split("/")[-1]
+    # Derived from key once at construction; the table and sort read these per row
+    name: str = field(init=False, repr=False, compare=False)
+    is_folder: bool = field(init=False, repr=False, compare=False)
 
-    @property
-    def is_folder(self) -> bool:
-        """Check if this represents a folder prefix."""
-        return self.key.endswith("/")
+    def __post_init__(self) -> None:
+        # Object name is the last part of the key; folder prefixes end with "/"
+        self.name = self.key.rstrip("/").rsplit("/", 1)[-1]
+        self.is_folder = self.key.endswith("/")
 
 
-@dataclass
+@dataclass(slots=True)
 class S3Bucket:
     """Represents an S3 bucket."""
 
@@ -67,17 +87,100 @@ class AsyncOperation:
     completed_items: int = 0
     error: str | None = None
     _cancelled: bool = False
+    _future: Future | None = field(default=None, repr=False, compare=False)
 
     def cancel(self) -> None:
         """Request cancellation of this operation."""
         self._cancelled = True
 
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Block until the operation's worker has finished, including on_complete.
+
+        Returns:
+            True if the worker finished, False if the timeout expired first
+        """
+        if self._future is None:
+            return True
+        done, _ = wait((self._future,), timeout=timeout)
+        return bool(done)
+
     @property
     def is_cancelled(self) -> bool:
         """Check if cancellation was requested."""
         return self._cancelled
 
 
+def _default_pool_size() -> int:
+    """
+    Pick a thread pool size for S3Client.
+
+    Honours $LOLRUS_S3_POOL when set to a positive integer; otherwise uses
+    twice the CPU count, clamped so small machines still overlap network
+    waits and large hosts don't flood the endpoint into SlowDown responses.
+    """
+    env_value = os.environ.get(POOL_SIZE_ENV)
+    if env_value:
+        try:
+            size = int(env_value)
+        except ValueError:
+            size = 0
+        if size > 0:
+            return size
+
+    return min(max(MIN_POOL_SIZE, (os.cpu_count() or MIN_POOL_SIZE) * 2), MAX_POOL_SIZE)
+
+
+def _remove_partial(local_path: str) -> None:
+    """Remove a partially written download, ignoring a file that was never created."""
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(local_path)
+
+
+def _make_transfer_callback(
+    op: AsyncOperation,
+    total_size: int,
+    on_progress: Callable[[AsyncOperation], None] | None,
+    action: str,
+) -> Callable[[int], None]:
+    """
+    Build a boto3 transfer Callback that updates op and throttles on_progress.
+
+    boto3 calls the callback for every chunk, possibly from several transfer
+    threads, so the running total is guarded by a lock and on_progress is only
+    invoked every PROGRESS_INTERVAL seconds and once the transfer is complete.
+
+    Args:
+        op: Operation to update
+        total_size: Expected number of bytes
+        on_progress: Callback for progress updates
+        action: Name used in the cancellation message (e.g., "Download")
+    """
+    lock = threading.Lock()
+    transferred = 0
+    last_emit = 0.0
+
+    def callback(bytes_transferred: int) -> None:
+        nonlocal transferred, last_emit
+        if op.is_cancelled:
+            raise InterruptedError(f"{action} cancelled")
+
+        with lock:
+            transferred += bytes_transferred
+            op.completed_items = transferred
+            op.progress = transferred / total_size if total_size > 0 else 1.0
+
+            now = time.monotonic()
+            if transferred < total_size and now - last_emit < PROGRESS_INTERVAL:
+                return
+            last_emit = now
+
+        if on_progress:
+            on_progress(op)
+
+    return callback
+
+
 class S3Client:
     """
     S3-compatible storage client with async operations.
@@ -93,6 +196,8 @@ class S3Client:
         secret_key: str,
         region: str = "us-east-1",
         log_callback: Callable[[str, str], None] | None = None,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
     ):
         """
         Initialize the S3 client.
@@ -103,16 +208,30 @@ class S3Client:
             secret_key: Secret access key
             region: Region name (default: us-east-1)
             log_callback: Optional callback for logging (message, level)
+            max_workers: Thread pool size for async operations. Defaults to
+                $LOLRUS_S3_POOL, else twice the CPU count clamped to 4-32.
+            executor: Optional executor to run async operations on instead of
+                a private pool. It is shared, so close() leaves it running.
         """
         self.endpoint_url = endpoint_url
         self.region = region
         self._log = log_callback or (lambda msg, level: None)
 
-        # Configure boto3 with retries and timeouts
+        # boto3 and botocore.config take ~100ms to import; defer until a client is needed
+        import boto3
+        from botocore.config import Config
+
+        if max_workers is None:
+            max_workers = _default_pool_size()
+
+        # Configure boto3 with retries and timeouts; size the HTTP pool so
+        # every worker thread can hold a connection
+        self._max_connections = max(10, max_workers)
         config = Config(
             retries={"max_attempts": 3, "mode": "adaptive"},
             connect_timeout=10,
             read_timeout=30,
+            max_pool_connections=self._max_connections,
         )
 
         self._client = boto3.client(
@@ -124,15 +243,20 @@ class S3Client:
             config=config,
         )
 
+        # Paginators are stateless, so build the listing one once and reuse it
+        self._list_paginator = self._client.get_paginator("list_objects_v2")
+
         # Thread pool for async operations
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lolrus-s3")
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lolrus-s3")
         self._operations: dict[str, AsyncOperation] = {}
         self._operation_counter = 0
         self._lock = threading.Lock()
 
     def close(self) -> None:
         """Shutdown the client and thread pool."""
-        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
 
     def _next_operation_id(self) -> str:
         """Generate a unique operation ID."""
@@ -140,6 +264,36 @@ class S3Client:
             self._operation_counter += 1
             return f"op-{self._operation_counter}"
 
+    def _delete_in_batches(
+        self,
+        bucket: str,
+        keys: Sequence[str],
+        op: AsyncOperation,
+        on_progress: Callable[[AsyncOperation], None] | None,
+    ) -> None:
+        """
+        Delete keys with one DeleteObjects request per batch, updating op as batches complete.
+
+        Sets op.status to CANCELLED and stops early if cancellation is requested.
+        """
+        # Bind once; attribute lookup on the boto3 client goes through its method mapping
+        delete_objects = self._client.delete_objects
+
+        for i in range(0, len(keys), DELETE_BATCH_SIZE):
+            if op.is_cancelled:
+                op.status = OperationStatus.CANCELLED
+                return
+
+            batch = keys[i : i + DELETE_BATCH_SIZE]
+            delete_objects(Bucket=bucket, Delete={"Objects": [{"Key": k} for k in batch], "Quiet": True})
+            self._log(f"Deleted batch of {len(batch)} objects", "DEBUG")
+
+            op.completed_items += len(batch)
+            op.progress = op.completed_items / op.total_items
+
+            if on_progress:
+                on_progress(op)
+
     # -------------------------------------------------------------------------
     # Synchronous operations (for quick calls)
     # -------------------------------------------------------------------------
@@ -157,32 +311,42 @@ class S3Client:
         response = self._client.list_buckets()
         return [S3Bucket(name=b["Name"], creation_date=b.get("CreationDate")) for b in response.get("Buckets", [])]
 
-    def list_objects(self, bucket: str, prefix: str = "", delimiter: str = "/") -> tuple[list[S3Object], list[str]]:
+    def iter_object_pages(self, bucket: str, prefix: str = "", delimiter: str = "/") -> Iterator[tuple[list[S3Object], list[str]]]:
         """
-        List objects in a bucket with optional prefix.
+        Stream a listing one page at a time.
+
+        Pages are fetched lazily as the iterator is consumed, so callers can
+        show the first rows of a large listing (or stop early) without waiting
+        for every page.
 
         Args:
             bucket: Bucket name
             prefix: Key prefix to filter by
             delimiter: Delimiter for "folder" grouping (default: /)
 
-        Returns:
-            Tuple of (objects, common_prefixes) where common_prefixes are "folders"
+        Yields:
+            Tuple of (objects, common_prefixes) for each page of up to 1000 keys
         """
-        objects = []
-        prefixes = []
+        for page in self._list_paginator.paginate(
+            Bucket=bucket,
+            Prefix=prefix,
+            Delimiter=delimiter,
+            FetchOwner=False,
+            PaginationConfig={"PageSize": LIST_PAGE_SIZE},
+        ):
+            objects: list[S3Object] = []
+            # Bound once; this loop runs per object
+            append_object = objects.append
 
-        paginator = self._client.get_paginator("list_objects_v2")
-
-        for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter=delimiter):
             # Get actual objects
-            for obj in page.get("Contents", []):
+            for obj in page.get("Contents", ()):
+                key = obj["Key"]
                 # Skip the prefix itself if it's listed
-                if obj["Key"] == prefix:
+                if key == prefix:
                     continue
-                objects.append(
+                append_object(
                     S3Object(
-                        key=obj["Key"],
+                        key=key,
                         size=obj["Size"],
                         last_modified=obj["LastModified"],
                         etag=obj["ETag"].strip('"'),
@@ -191,11 +355,61 @@ class S3Client:
                 )
 
             # Get "folder" prefixes
-            for p in page.get("CommonPrefixes", []):
-                prefixes.append(p["Prefix"])
+            yield objects, [p["Prefix"] for p in page.get("CommonPrefixes", ())]
+
+    def list_objects(self, bucket: str, prefix: str = "", delimiter: str = "/") -> tuple[list[S3Object], list[str]]:
+        """
+        List objects in a bucket with optional prefix.
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix to filter by
+            delimiter: Delimiter for "folder" grouping (default: /)
+
+        Returns:
+            Tuple of (objects, common_prefixes) where common_prefixes are "folders"
+        """
+        objects: list[S3Object] = []
+        prefixes: list[str] = []
+
+        for page_objects, page_prefixes in self.iter_object_pages(bucket, prefix, delimiter):
+            objects.extend(page_objects)
+            prefixes.extend(page_prefixes)
 
         return objects, prefixes
 
+    def list_objects_parallel(
+        self,
+        bucket: str,
+        prefixes: Sequence[str],
+        delimiter: str = "/",
+        max_workers: int | None = None,
+    ) -> list[tuple[list[S3Object], list[str]]]:
+        """
+        List several prefixes concurrently.
+
+        Each prefix is listed with list_objects on its own thread, so the
+        request latency of one prefix overlaps with the others. Uses a
+        short-lived pool rather than the async executor, which may be the
+        caller's own thread.
+
+        Args:
+            bucket: Bucket name
+            prefixes: Key prefixes to list
+            delimiter: Delimiter for "folder" grouping (default: /)
+            max_workers: Maximum concurrent listings. Defaults to the HTTP
+                connection pool size, so no request waits for a connection.
+
+        Returns:
+            One (objects, common_prefixes) tuple per prefix, in the order given
+        """
+        if not prefixes:
+            return []
+
+        workers = min(len(prefixes), max_workers or self._max_connections)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lolrus-list") as pool:
+            return list(pool.map(lambda prefix: self.list_objects(bucket, prefix, delimiter), prefixes))
+
     def get_object_info(self, bucket: str, key: str) -> dict:
         """Get detailed metadata for an object."""
         response = self._client.head_object(Bucket=bucket, Key=key)
@@ -212,6 +426,9 @@ class S3Client:
         """
         Download object content to memory (with size limit).
 
+        Returns immutable bytes so previews can wrap them in io.BytesIO
+        without a copy; BytesIO copies a bytearray.
+
         Args:
             bucket: Bucket name
             key: Object key
@@ -237,7 +454,7 @@ class S3Client:
     def delete_objects_async(
         self,
         bucket: str,
-        keys: list[str],
+        keys: Sequence[str],
         on_progress: Callable[[AsyncOperation], None] | None = None,
         on_complete: Callable[[AsyncOperation], None] | None = None,
     ) -> AsyncOperation:
@@ -246,7 +463,7 @@ class S3Client:
 
         Args:
             bucket: Bucket name
-            keys: List of object keys to delete
+            keys: Object keys to delete
             on_progress: Callback for progress updates
             on_complete: Callback when operation completes
 
@@ -264,24 +481,7 @@ class S3Client:
             op.status = OperationStatus.RUNNING
             self._log(f"Starting delete of {len(keys)} objects", "DEBUG")
             try:
-                # Delete in batches of 1000 (S3 limit)
-                batch_size = 1000
-                for i in range(0, len(keys), batch_size):
-                    if op.is_cancelled:
-                        op.status = OperationStatus.CANCELLED
-                        break
-
-                    batch = keys[i : i + batch_size]
-                    delete_request = {"Objects": [{"Key": k} for k in batch], "Quiet": True}
-
-                    self._client.delete_objects(Bucket=bucket, Delete=delete_request)
-                    self._log(f"Deleted batch of {len(batch)} objects", "DEBUG")
-
-                    op.completed_items += len(batch)
-                    op.progress = op.completed_items / op.total_items
-
-                    if on_progress:
-                        on_progress(op)
+                self._delete_in_batches(bucket, keys, op, on_progress)
 
                 if op.status != OperationStatus.CANCELLED:
                     op.status = OperationStatus.COMPLETED
@@ -296,7 +496,7 @@ class S3Client:
             if on_complete:
                 on_complete(op)
 
-        self._executor.submit(do_delete)
+        op._future = self._executor.submit(do_delete)
         return op
 
     def download_object_async(
@@ -328,39 +528,54 @@ class S3Client:
 
         def do_download():
             op.status = OperationStatus.RUNNING
+            body = None
+            # Never write to local_path directly, so a failed or cancelled
+            # download leaves any existing file there untouched
+            part_path = local_path + PARTIAL_DOWNLOAD_SUFFIX
             try:
-                # Get object size first
-                head = self._client.head_object(Bucket=bucket, Key=key)
-                total_size = head.get("ContentLength", 0)
+                response = self._client.get_object(Bucket=bucket, Key=key)
+                body = response["Body"]
+                total_size = response.get("ContentLength", 0)
                 op.total_items = total_size
 
-                downloaded = 0
-
-                def progress_callback(bytes_transferred):
-                    nonlocal downloaded
-                    if op.is_cancelled:
-                        raise InterruptedError("Download cancelled")
-                    downloaded += bytes_transferred
-                    op.completed_items = downloaded
-                    op.progress = downloaded / total_size if total_size > 0 else 1.0
-                    if on_progress:
-                        on_progress(op)
-
-                self._client.download_file(bucket, key, local_path, Callback=progress_callback)
-
-                op.status = OperationStatus.COMPLETED
-                op.progress = 1.0
+                progress_callback = _make_transfer_callback(op, total_size, on_progress, "Download")
+
+                # Stream the body ourselves so a cancel closes the connection
+                # cleanly instead of aborting the transfer mid-request
+                cancelled = False
+                with open(part_path, "wb") as f:
+                    for chunk in body.iter_chunks(DOWNLOAD_CHUNK_SIZE):
+                        if op.is_cancelled:
+                            cancelled = True
+                            break
+                        f.write(chunk)
+                        progress_callback(len(chunk))
+
+                if cancelled:
+                    op.status = OperationStatus.CANCELLED
+                    _remove_partial(part_path)
+                else:
+                    os.replace(part_path, local_path)
+                    op.status = OperationStatus.COMPLETED
+                    op.progress = 1.0
 
             except InterruptedError:
+                # Raised by progress_callback when a cancel lands after the loop's check
                 op.status = OperationStatus.CANCELLED
-            except ClientError as e:
+                _remove_partial(part_path)
+            except (BotoCoreError, ClientError, OSError) as e:
+                # BotoCoreError covers errors while streaming (read timeouts, dropped connections)
                 op.status = OperationStatus.FAILED
                 op.error = str(e)
+                _remove_partial(part_path)
+            finally:
+                if body is not None:
+                    body.close()
 
             if on_complete:
                 on_complete(op)
 
-        self._executor.submit(do_download)
+        op._future = self._executor.submit(do_download)
         return op
 
     def upload_file_async(
@@ -384,8 +599,6 @@ class S3Client:
         Returns:
             AsyncOperation tracking the upload
         """
-        import os
-
         op = AsyncOperation(
             id=self._next_operation_id(),
             description=f"Uploading {os.path.basename(local_path)}",
@@ -398,18 +611,7 @@ class S3Client:
                 total_size = os.path.getsize(local_path)
                 op.total_items = total_size
 
-                uploaded = 0
-
-                def progress_callback(bytes_transferred):
-                    nonlocal uploaded
-                    if op.is_cancelled:
-                        raise InterruptedError("Upload cancelled")
-                    uploaded += bytes_transferred
-                    op.completed_items = uploaded
-                    op.progress = uploaded / total_size if total_size > 0 else 1.0
-                    if on_progress:
-                        on_progress(op)
-
+                progress_callback = _make_transfer_callback(op, total_size, on_progress, "Upload")
                 self._client.upload_file(local_path, bucket, key, Callback=progress_callback)
 
                 op.status = OperationStatus.COMPLETED
@@ -424,7 +626,7 @@ class S3Client:
             if on_complete:
                 on_complete(op)
 
-        self._executor.submit(do_upload)
+        op._future = self._executor.submit(do_upload)
         return op
 
     def empty_bucket_async(
@@ -454,10 +656,9 @@ class S3Client:
             op.status = OperationStatus.RUNNING
             try:
                 # First, count all objects
-                paginator = self._client.get_paginator("list_objects_v2")
                 all_keys = []
 
-                for page in paginator.paginate(Bucket=bucket):
+                for page in self._list_paginator.paginate(Bucket=bucket, FetchOwner=False, PaginationConfig={"PageSize": LIST_PAGE_SIZE}):
                     if op.is_cancelled:
                         op.status = OperationStatus.CANCELLED
                         if on_complete:
@@ -476,23 +677,7 @@ class S3Client:
                         on_complete(op)
                     return
 
-                # Delete in batches
-                batch_size = 1000
-                for i in range(0, len(all_keys), batch_size):
-                    if op.is_cancelled:
-                        op.status = OperationStatus.CANCELLED
-                        break
-
-                    batch = all_keys[i : i + batch_size]
-                    delete_request = {"Objects": [{"Key": k} for k in batch], "Quiet": True}
-
-                    self._client.delete_objects(Bucket=bucket, Delete=delete_request)
-
-                    op.completed_items += len(batch)
-                    op.progress = op.completed_items / op.total_items
-
-                    if on_progress:
-                        on_progress(op)
+                self._delete_in_batches(bucket, all_keys, op, on_progress)
 
                 if op.status != OperationStatus.CANCELLED:
                     op.status = OperationStatus.COMPLETED
@@ -505,7 +690,7 @@ class S3Client:
             if on_complete:
                 on_complete(op)
 
-        self._executor.submit(do_empty)
+        op._future = self._executor.submit(do_empty)
         return op
 
     def get_operation(self, operation_id: str) -> AsyncOperation | None:
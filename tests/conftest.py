@@ -0,0 +1,121 @@
+"""
+Shared pytest fixtures.
+
+Fixtures that tests configure or assert on are function-scoped so every test
+starts clean and the suite can run under pytest-xdist. Only the stateless
+executor and boto session are session-scoped, which under xdist means one
+per worker.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import boto3
+import keyring.errors
+import pytest
+from botocore.stub import Stubber
+
+import lolrus.connections
+from lolrus.s3_client import S3Client
+
+# boto3 S3 client methods S3Client calls; anything else is a typo in the test.
+_S3_METHODS = (
+    "delete_objects",
+    "get_object",
+    "get_paginator",
+    "head_object",
+    "list_buckets",
+    "upload_file",
+)
+
+
+@pytest.fixture
+def fake_keyring(monkeypatch):
+    """Replace the keyring module used by lolrus.connections with lightweight mocks."""
+    fake = SimpleNamespace(
+        set_password=Mock(),
+        get_password=Mock(return_value=None),
+        delete_password=Mock(),
+        errors=keyring.errors,
+    )
+    monkeypatch.setattr(lolrus.connections, "keyring", fake)
+    return fake
+
+
+@pytest.fixture
+def fake_boto_client(monkeypatch):
+    """Replace boto3.client with a factory that returns one shared mock S3 client."""
+    s3 = Mock(spec_set=_S3_METHODS)
+    s3.get_paginator.return_value = Mock(spec_set=("paginate",))
+    factory = Mock(return_value=s3)
+    monkeypatch.setattr("boto3.client", factory)
+    return factory
+
+
+@pytest.fixture
+def fake_s3(fake_boto_client):
+    """The mock S3 client handed to every S3Client built during the test."""
+    return fake_boto_client.return_value
+
+
+@pytest.fixture(scope="session")
+def boto_session():
+    """A private boto3 session, so s3_stubber can build real clients while boto3.client is patched."""
+    return boto3.session.Session()
+
+
+@pytest.fixture
+def s3_stubber(monkeypatch, boto_session):
+    """
+    A Stubber on a real botocore S3 client, which boto3.client then returns.
+
+    Queued responses are validated against the S3 API model and each call's
+    parameters must match what the test expects; any response left unused
+    fails the test.
+    """
+    s3 = boto_session.client(
+        "s3",
+        endpoint_url="https://example.com",
+        region_name="us-east-1",
+        aws_access_key_id="access",
+        aws_secret_access_key="secret",
+    )
+    monkeypatch.setattr("boto3.client", lambda *args, **kwargs: s3)
+    with Stubber(s3) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+@pytest.fixture(scope="session")
+def executor():
+    """One worker pool shared by every client fixture, instead of a pool per test."""
+    pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="lolrus-test")
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def client(fake_s3, executor):
+    """An S3Client wired to fake_s3 and the shared executor, closed after the test."""
+    s3_client = S3Client(
+        endpoint_url="https://example.com",
+        access_key="access",
+        secret_key="secret",
+        executor=executor,
+    )
+    yield s3_client
+    s3_client.close()
+
+
+@pytest.fixture
+def stubbed_client(s3_stubber, executor):
+    """An S3Client whose requests are answered by s3_stubber, closed after the test."""
+    s3_client = S3Client(
+        endpoint_url="https://example.com",
+        access_key="access",
+        secret_key="secret",
+        executor=executor,
+    )
+    yield s3_client
+    s3_client.close()
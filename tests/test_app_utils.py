@@ -5,8 +5,11 @@ These tests cover non-GUI utility methods that can be tested in isolation.
 """
 
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+from botocore.exceptions import EndpointConnectionError
+
+from lolrus.connections import Connection, ConnectionManager
 from lolrus.s3_client import S3Object
 
 
@@ -249,3 +252,63 @@ class TestPreviewTypeExtensions:
             obj = self._create_obj(f"test{ext}")
             result = app._get_preview_type(obj)
             assert result == "archive", f"Expected 'archive' for {ext}, got {result}"
+
+
+class TestSaveConnectionDialog:
+    """Tests for saving a connection from the edit dialog."""
+
+    def test_rename_active_connection_drops_closed_client(self, fake_keyring, fake_boto_client, tmp_path, monkeypatch):
+        """Test renaming the active connection stops using the client the manager closed."""
+        from lolrus.app import LolrusApp
+
+        values = {
+            "conn_name": "renamed",
+            "conn_endpoint": "https://example.com",
+            "conn_access_key": "access",
+            "conn_secret_key": "secret",
+            "conn_region": "us-east-1",
+        }
+        monkeypatch.setattr("lolrus.app.dpg", Mock(get_value=values.get))
+
+        with patch.object(LolrusApp, '__init__', lambda self: None):
+            app = LolrusApp()
+        app._update_connection_combo = Mock()
+        app._set_status = Mock()
+        app.connection_manager = ConnectionManager(config_dir=tmp_path)
+        app.connection_manager.save_connection(
+            Connection(name="original", endpoint_url="https://example.com", access_key="access", secret_key="secret")
+        )
+        app.current_connection = app.connection_manager.get_connection("original")
+        app.s3_client = app.connection_manager.get_client("original")
+
+        app._save_connection_from_dialog("conn_dialog", "original")
+
+        assert app.current_connection is None
+        assert app.s3_client is None
+        assert app.connection_manager.get_connection("renamed") is not None
+
+
+class TestConnectionSelected:
+    """Tests for selecting a connection."""
+
+    def test_connection_error_drops_pooled_client(self, fake_keyring, fake_s3, tmp_path, monkeypatch):
+        """Test a client that raised while connecting is not reused by the next selection."""
+        from lolrus.app import LolrusApp
+
+        monkeypatch.setattr("lolrus.app.dpg", Mock())
+        fake_s3.list_buckets.side_effect = EndpointConnectionError(endpoint_url="https://example.com")
+
+        with patch.object(LolrusApp, '__init__', lambda self: None):
+            app = LolrusApp()
+        app._set_status = Mock()
+        app._add_log = Mock()
+        app.connection_manager = ConnectionManager(config_dir=tmp_path)
+        app.connection_manager.save_connection(
+            Connection(name="broken", endpoint_url="https://example.com", access_key="access", secret_key="secret")
+        )
+        first_client = app.connection_manager.get_client("broken")
+
+        app._on_connection_selected(None, "broken")
+
+        assert app.s3_client is None
+        assert app.connection_manager.get_client("broken") is not first_client
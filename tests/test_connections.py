@@ -5,7 +5,14 @@ Tests for the connection management module.
 import json
 from unittest.mock import patch
 
-from lolrus.connections import KEYRING_SERVICE, Connection, ConnectionManager
+import pytest
+
+from lolrus.connections import KEYRING_SERVICE, Connection, ConnectionManager, _keyring_key
+
+
+def _keyring_calls(fake_keyring) -> int:
+    """Total keyring round-trips made through the fake."""
+    return sum(m.call_count for m in (fake_keyring.get_password, fake_keyring.set_password, fake_keyring.delete_password))
 
 
 class TestConnection:
@@ -95,6 +102,39 @@ class TestConnectionManager:
         assert "conn1" in names
         assert "conn2" in names
 
+    def test_defers_loading_until_first_access(self, tmp_path):
+        """Test the connections file is not read until connections are requested."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        connections_file = config_dir / "connections.json"
+        connections_file.write_text(json.dumps({"connections": []}))
+
+        manager = ConnectionManager(config_dir=config_dir)
+        connections_file.write_text(json.dumps({
+            "connections": [
+                {"name": "late", "endpoint_url": "https://example.com"},
+            ]
+        }))
+
+        assert [c.name for c in manager.list_connections()] == ["late"]
+
+    def test_save_before_load_keeps_existing_connections(self, fake_keyring, tmp_path):
+        """Test saving on a fresh manager merges with connections already on disk."""
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        connections_file = config_dir / "connections.json"
+        connections_file.write_text(json.dumps({
+            "connections": [
+                {"name": "existing", "endpoint_url": "https://example.com"},
+            ]
+        }))
+
+        manager = ConnectionManager(config_dir=config_dir)
+        manager.save_connection(Connection(name="new", endpoint_url="https://example.com"))
+
+        data = json.loads(connections_file.read_text())
+        assert [c["name"] for c in data["connections"]] == ["existing", "new"]
+
     def test_handles_corrupted_config_file(self, tmp_path):
         """Test ConnectionManager handles corrupted JSON gracefully."""
         config_dir = tmp_path / "config"
@@ -117,8 +157,7 @@ class TestConnectionManager:
 
         assert len(connections) == 0
 
-    @patch("lolrus.connections.keyring")
-    def test_save_connection_stores_in_keyring(self, mock_keyring, tmp_path):
+    def test_save_connection_stores_in_keyring(self, fake_keyring, tmp_path):
         """Test save_connection stores credentials in keyring."""
         config_dir = tmp_path / "config"
         manager = ConnectionManager(config_dir=config_dir)
@@ -132,24 +171,69 @@ class TestConnectionManager:
         )
         manager.save_connection(conn)
 
-        # Verify keyring was called
-        assert mock_keyring.set_password.call_count == 2
-        mock_keyring.set_password.assert_any_call(
-            KEYRING_SERVICE, "test-conn:access_key", "my-access-key"
-        )
-        mock_keyring.set_password.assert_any_call(
-            KEYRING_SERVICE, "test-conn:secret_key", "my-secret-key"
-        )
+        # Verify both credentials went into a single keyring entry
+        fake_keyring.set_password.assert_called_once()
+        service, key, value = fake_keyring.set_password.call_args[0]
+        assert service == KEYRING_SERVICE
+        assert key == "test-conn:creds"
+        assert json.loads(value) == {"access_key": "my-access-key", "secret_key": "my-secret-key"}
 
         # Verify connection metadata was saved
         connections = manager.list_connections()
         assert len(connections) == 1
         assert connections[0].name == "test-conn"
 
-    @patch("lolrus.connections.keyring")
-    def test_get_connection_loads_credentials(self, mock_keyring, tmp_path):
-        """Test get_connection loads credentials from keyring."""
-        mock_keyring.get_password.side_effect = lambda service, key: {
+    def test_get_connection_loads_credentials(self, fake_keyring, tmp_path):
+        """Test get_connection loads credentials with a single keyring lookup."""
+        fake_keyring.get_password.side_effect = lambda service, key: {
+            "test-conn:creds": json.dumps({"access_key": "loaded-access", "secret_key": "loaded-secret"}),
+        }.get(key)
+
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        connections_file = config_dir / "connections.json"
+        connections_file.write_text(json.dumps({
+            "connections": [
+                {"name": "test-conn", "endpoint_url": "https://example.com", "region": "us-east-1"},
+            ]
+        }))
+
+        manager = ConnectionManager(config_dir=config_dir)
+        conn = manager.get_connection("test-conn", load_credentials=True)
+
+        assert conn is not None
+        assert conn.access_key == "loaded-access"
+        assert conn.secret_key == "loaded-secret"
+        fake_keyring.get_password.assert_called_once_with(KEYRING_SERVICE, "test-conn:creds")
+
+    def test_get_connection_caches_credentials(self, fake_keyring, tmp_path):
+        """Test repeated get_connection calls reuse cached credentials until cleared."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "a", "secret_key": "s"})
+
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        connections_file = config_dir / "connections.json"
+        connections_file.write_text(json.dumps({
+            "connections": [
+                {"name": "test-conn", "endpoint_url": "https://example.com"},
+            ]
+        }))
+
+        manager = ConnectionManager(config_dir=config_dir)
+        manager.get_connection("test-conn")
+        conn = manager.get_connection("test-conn")
+
+        assert conn.access_key == "a"
+        assert conn.secret_key == "s"
+        assert fake_keyring.get_password.call_count == 1
+
+        manager.clear_credentials_cache()
+        manager.get_connection("test-conn")
+        assert fake_keyring.get_password.call_count == 2
+
+    def test_get_connection_loads_legacy_credentials(self, fake_keyring, tmp_path):
+        """Test get_connection falls back to per-field keyring entries."""
+        fake_keyring.get_password.side_effect = lambda service, key: {
             "test-conn:access_key": "loaded-access",
             "test-conn:secret_key": "loaded-secret",
         }.get(key)
@@ -170,8 +254,58 @@ class TestConnectionManager:
         assert conn.access_key == "loaded-access"
         assert conn.secret_key == "loaded-secret"
 
-    @patch("lolrus.connections.keyring")
-    def test_get_connection_without_credentials(self, mock_keyring, tmp_path):
+        # Migrated to the combined entry, with the legacy secrets removed
+        fake_keyring.set_password.assert_called_once_with(
+            KEYRING_SERVICE,
+            "test-conn:creds",
+            json.dumps({"access_key": "loaded-access", "secret_key": "loaded-secret"}, separators=(",", ":")),
+        )
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:access_key")
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:secret_key")
+
+    def test_save_connection_single_keyring_call(self, fake_keyring, tmp_path):
+        """Test saving both credentials costs one keyring call."""
+        manager = ConnectionManager(config_dir=tmp_path / "config")
+        manager.save_connection(
+            Connection(name="test-conn", endpoint_url="https://example.com", access_key="new-access", secret_key="new-secret")
+        )
+
+        assert _keyring_calls(fake_keyring) == 1
+        fake_keyring.set_password.assert_called_once()
+
+    def test_delete_migrated_connection_single_keyring_call(self, fake_keyring, tmp_path):
+        """Test deleting a connection whose combined entry was read skips the legacy deletes."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "a", "secret_key": "s"})
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "connections.json").write_text(json.dumps({
+            "connections": [
+                {"name": "test-conn", "endpoint_url": "https://example.com"},
+            ]
+        }))
+        manager = ConnectionManager(config_dir=config_dir)
+        manager.get_connection("test-conn")
+        calls_before = _keyring_calls(fake_keyring)
+
+        manager.delete_connection("test-conn")
+
+        assert _keyring_calls(fake_keyring) - calls_before == 1
+        fake_keyring.delete_password.assert_called_once_with(KEYRING_SERVICE, "test-conn:creds")
+
+    def test_save_connection_blank_field_keeps_stored_value(self, fake_keyring, tmp_path):
+        """Test saving with one blank credential keeps the stored value for that field."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "old-access", "secret_key": "old-secret"})
+        manager = ConnectionManager(config_dir=tmp_path / "config")
+
+        manager.save_connection(Connection(name="test-conn", endpoint_url="https://example.com", access_key="new-access"))
+
+        fake_keyring.set_password.assert_called_once_with(
+            KEYRING_SERVICE,
+            "test-conn:creds",
+            json.dumps({"access_key": "new-access", "secret_key": "old-secret"}, separators=(",", ":")),
+        )
+
+    def test_get_connection_without_credentials(self, fake_keyring, tmp_path):
         """Test get_connection can skip loading credentials."""
         config_dir = tmp_path / "config"
         config_dir.mkdir()
@@ -188,7 +322,7 @@ class TestConnectionManager:
         assert conn is not None
         assert conn.access_key == ""
         assert conn.secret_key == ""
-        mock_keyring.get_password.assert_not_called()
+        fake_keyring.get_password.assert_not_called()
 
     def test_get_connection_not_found(self, tmp_path):
         """Test get_connection returns None for nonexistent connection."""
@@ -198,8 +332,7 @@ class TestConnectionManager:
         conn = manager.get_connection("nonexistent")
         assert conn is None
 
-    @patch("lolrus.connections.keyring")
-    def test_delete_connection_removes_from_keyring(self, mock_keyring, tmp_path):
+    def test_delete_connection_removes_from_keyring(self, fake_keyring, tmp_path):
         """Test delete_connection removes credentials from keyring."""
         config_dir = tmp_path / "config"
         config_dir.mkdir()
@@ -214,9 +347,9 @@ class TestConnectionManager:
         result = manager.delete_connection("test-conn")
 
         assert result is True
-        assert mock_keyring.delete_password.call_count == 2
-        mock_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:access_key")
-        mock_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:secret_key")
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:creds")
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:access_key")
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "test-conn:secret_key")
 
         # Verify connection was removed from list
         connections = manager.list_connections()
@@ -230,12 +363,9 @@ class TestConnectionManager:
         result = manager.delete_connection("nonexistent")
         assert result is False
 
-    @patch("lolrus.connections.keyring")
-    def test_delete_connection_handles_keyring_error(self, mock_keyring, tmp_path):
+    def test_delete_connection_handles_keyring_error(self, fake_keyring, tmp_path):
         """Test delete_connection handles keyring errors gracefully."""
-        import keyring.errors
-        mock_keyring.errors = keyring.errors
-        mock_keyring.delete_password.side_effect = keyring.errors.PasswordDeleteError()
+        fake_keyring.delete_password.side_effect = fake_keyring.errors.PasswordDeleteError()
 
         config_dir = tmp_path / "config"
         config_dir.mkdir()
@@ -253,10 +383,9 @@ class TestConnectionManager:
         assert result is True
         assert len(manager.list_connections()) == 0
 
-    @patch("lolrus.connections.keyring")
-    def test_rename_connection_success(self, mock_keyring, tmp_path):
+    def test_rename_connection_success(self, fake_keyring, tmp_path):
         """Test rename_connection successfully renames a connection."""
-        mock_keyring.get_password.side_effect = lambda service, key: {
+        fake_keyring.get_password.side_effect = lambda service, key: {
             "old-name:access_key": "access",
             "old-name:secret_key": "secret",
         }.get(key)
@@ -279,6 +408,16 @@ class TestConnectionManager:
         assert "new-name" in names
         assert "old-name" not in names
 
+        # Credentials follow the connection to its new keyring entry
+        service, key, value = fake_keyring.set_password.call_args[0]
+        assert key == "new-name:creds"
+        assert json.loads(value) == {"access_key": "access", "secret_key": "secret"}
+        fake_keyring.delete_password.assert_any_call(KEYRING_SERVICE, "old-name:access_key")
+
+        # The renamed connection is what ends up on disk
+        data = json.loads(connections_file.read_text())
+        assert [c["name"] for c in data["connections"]] == ["new-name"]
+
     def test_rename_connection_old_not_found(self, tmp_path):
         """Test rename_connection returns False if old name not found."""
         config_dir = tmp_path / "config"
@@ -287,8 +426,7 @@ class TestConnectionManager:
         result = manager.rename_connection("nonexistent", "new-name")
         assert result is False
 
-    @patch("lolrus.connections.keyring")
-    def test_rename_connection_new_name_exists(self, mock_keyring, tmp_path):
+    def test_rename_connection_new_name_exists(self, fake_keyring, tmp_path):
         """Test rename_connection returns False if new name already exists."""
         config_dir = tmp_path / "config"
         config_dir.mkdir()
@@ -330,31 +468,24 @@ class TestConnectionManager:
 class TestKeyringKeyFormat:
     """Tests for keyring key generation."""
 
-    def test_keyring_key_format(self, tmp_path):
+    def test_keyring_key_format(self):
         """Test _keyring_key generates correct format."""
-        config_dir = tmp_path / "config"
-        manager = ConnectionManager(config_dir=config_dir)
-
-        access_key = manager._keyring_key("my-connection", "access_key")
-        secret_key = manager._keyring_key("my-connection", "secret_key")
+        access_key = _keyring_key("my-connection", "access_key")
+        secret_key = _keyring_key("my-connection", "secret_key")
 
         assert access_key == "my-connection:access_key"
         assert secret_key == "my-connection:secret_key"
 
-    def test_keyring_key_special_characters(self, tmp_path):
+    def test_keyring_key_special_characters(self):
         """Test _keyring_key handles special characters in connection name."""
-        config_dir = tmp_path / "config"
-        manager = ConnectionManager(config_dir=config_dir)
-
-        key = manager._keyring_key("My Connection (Test)", "access_key")
+        key = _keyring_key("My Connection (Test)", "access_key")
         assert key == "My Connection (Test):access_key"
 
 
 class TestConnectionPersistence:
     """Tests for connection persistence to disk."""
 
-    @patch("lolrus.connections.keyring")
-    def test_connections_persisted_to_json(self, mock_keyring, tmp_path):
+    def test_connections_persisted_to_json(self, fake_keyring, tmp_path):
         """Test connections are persisted to JSON file."""
         config_dir = tmp_path / "config"
         manager = ConnectionManager(config_dir=config_dir)
@@ -380,8 +511,36 @@ class TestConnectionPersistence:
         assert "access_key" not in data["connections"][0]
         assert "secret_key" not in data["connections"][0]
 
-    @patch("lolrus.connections.keyring")
-    def test_connections_survive_reload(self, mock_keyring, tmp_path):
+    def test_save_is_atomic(self, fake_keyring, tmp_path):
+        """Test a failed write leaves the previous file intact and no temp file behind."""
+        config_dir = tmp_path / "config"
+        manager = ConnectionManager(config_dir=config_dir)
+        manager.save_connection(Connection(name="first", endpoint_url="https://example.com"))
+
+        connections_file = config_dir / "connections.json"
+        original = connections_file.read_bytes()
+
+        with patch("lolrus.connections.os.replace", side_effect=OSError("disk full")), pytest.raises(OSError):
+            manager.save_connection(Connection(name="second", endpoint_url="https://example.com"))
+
+        assert connections_file.read_bytes() == original
+        assert list(config_dir.iterdir()) == [connections_file]
+
+    def test_unchanged_save_skips_write(self, fake_keyring, tmp_path):
+        """Test saving identical metadata again does not rewrite the file."""
+        config_dir = tmp_path / "config"
+        manager = ConnectionManager(config_dir=config_dir)
+        conn = Connection(name="same", endpoint_url="https://example.com", access_key="a", secret_key="s")
+
+        with patch("lolrus.connections._atomic_write") as mock_write:
+            manager.save_connection(conn)
+            manager.save_connection(conn)
+            assert mock_write.call_count == 1
+
+            manager.save_connection(Connection(name="same", endpoint_url="https://other.example.com"))
+            assert mock_write.call_count == 2
+
+    def test_connections_survive_reload(self, fake_keyring, tmp_path):
         """Test connections survive manager reload."""
         config_dir = tmp_path / "config"
 
@@ -401,3 +560,57 @@ class TestConnectionPersistence:
 
         assert len(connections) == 1
         assert connections[0].name == "survivor"
+
+
+class TestClientPool:
+    """Tests for pooled S3 clients on ConnectionManager."""
+
+    def _manager(self, tmp_path):
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        (config_dir / "connections.json").write_text(json.dumps({
+            "connections": [
+                {"name": "x", "endpoint_url": "https://example.com"},
+            ]
+        }))
+        return ConnectionManager(config_dir=config_dir)
+
+    def test_get_client_reuses_instance(self, fake_boto_client, fake_keyring, tmp_path):
+        """Test repeated get_client calls return the same client."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "a", "secret_key": "s"})
+        manager = self._manager(tmp_path)
+
+        client1 = manager.get_client("x")
+        client2 = manager.get_client("x")
+
+        assert client1 is client2
+        fake_boto_client.assert_called_once()
+        manager.close()
+
+    def test_get_client_rebuilds_after_credentials_change(self, fake_boto_client, fake_keyring, tmp_path):
+        """Test a changed connection gets a fresh client and the stale one is closed."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "a", "secret_key": "s"})
+        manager = self._manager(tmp_path)
+
+        client1 = manager.get_client("x")
+        manager.save_connection(Connection(name="x", endpoint_url="https://example.com", access_key="a2", secret_key="s2"))
+        client2 = manager.get_client("x")
+
+        assert client1 is not client2
+        assert client1._executor._shutdown is True
+        manager.close()
+
+    def test_get_client_not_found(self, fake_keyring, tmp_path):
+        """Test get_client returns None for an unknown connection."""
+        manager = self._manager(tmp_path)
+        assert manager.get_client("missing") is None
+
+    def test_delete_connection_closes_client(self, fake_boto_client, fake_keyring, tmp_path):
+        """Test deleting a connection closes its pooled client."""
+        fake_keyring.get_password.return_value = json.dumps({"access_key": "a", "secret_key": "s"})
+        manager = self._manager(tmp_path)
+
+        client = manager.get_client("x")
+        manager.delete_connection("x")
+
+        assert client._executor._shutdown is True
@@ -2,55 +2,142 @@
 Tests for the S3 client wrapper.
 """
 
-import threading
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from itertools import islice
+from unittest.mock import Mock
 
 import pytest
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, ResponseStreamingError
+
+from lolrus.connections import Connection
+from lolrus.s3_client import (
+    AsyncOperation,
+    OperationStatus,
+    S3Bucket,
+    S3Client,
+    S3Object,
+    _default_pool_size,
+    _make_transfer_callback,
+)
+
+_NOW = datetime(2024, 1, 1)
+
+# Read-only objects shared by the S3Object tests; never mutate these
+_FOLDER_OBJ = S3Object(key="folder/", size=0, last_modified=_NOW, etag="abc123")
+_FILE_OBJ = S3Object(key="file.txt", size=100, last_modified=_NOW, etag="abc123")
+
+# Canned list_objects_v2 pages shared by the listing tests.
+_PAGE_TWO_FILES_TWO_PREFIXES = (
+    {
+        "Contents": [
+            {
+                "Key": "file1.txt",
+                "Size": 100,
+                "LastModified": datetime(2024, 1, 1),
+                "ETag": '"abc123"',
+                "StorageClass": "STANDARD",
+            },
+            {
+                "Key": "file2.txt",
+                "Size": 200,
+                "LastModified": datetime(2024, 1, 2),
+                "ETag": '"def456"',
+            },
+        ],
+        "CommonPrefixes": [
+            {"Prefix": "folder1/"},
+            {"Prefix": "folder2/"},
+        ],
+    },
+)
+
+_PAGE_ONE_FILE_IN_FOLDER = (
+    {
+        "Contents": [
+            {
+                "Key": "folder/file.txt",
+                "Size": 100,
+                "LastModified": datetime(2024, 1, 1),
+                "ETag": '"abc123"',
+            },
+        ],
+        "CommonPrefixes": [],
+    },
+)
+
+_PAGE_FOLDER_MARKER_AND_FILE = (
+    {
+        "Contents": [
+            {
+                "Key": "folder/",  # The prefix itself
+                "Size": 0,
+                "LastModified": datetime(2024, 1, 1),
+                "ETag": '"abc"',
+            },
+            {
+                "Key": "folder/file.txt",
+                "Size": 100,
+                "LastModified": datetime(2024, 1, 1),
+                "ETag": '"def"',
+            },
+        ],
+    },
+)
+
+_PAGE_EMPTY = ({},)  # No Contents or CommonPrefixes
+
+# Two full pages of a truncated listing, linked by a continuation token
+_TWO_FULL_PAGES = tuple(
+    {
+        "Contents": [
+            {
+                "Key": f"page{page}/file{i}.txt",
+                "Size": i,
+                "LastModified": datetime(2024, 1, 1),
+                "ETag": '"abc"',
+            }
+            for i in range(1000)
+        ],
+        "IsTruncated": page == 0,
+        **({"NextContinuationToken": "token-1"} if page == 0 else {}),
+    }
+    for page in range(2)
+)
 
-from lolrus.s3_client import AsyncOperation, OperationStatus, S3Bucket, S3Client, S3Object
+_TEN_KEYS = tuple(f"key{i}" for i in range(10))
+
+_TOO_LARGE_RE = re.compile(r"too large for preview")
+
+
+@pytest.fixture(autouse=True)
+def _no_real_boto_client(fake_boto_client):
+    """Make sure no test in this module builds a real boto3 client by accident."""
 
 
 class TestS3Object:
     """Tests for S3Object dataclass."""
 
-    def test_name_extraction(self):
-        """Test extracting name from key."""
-        obj = S3Object(
-            key="folder/subfolder/file.txt",
-            size=100,
-            last_modified=datetime.now(),
-            etag="abc123",
-        )
-        assert obj.name == "file.txt"
-
-    def test_name_with_trailing_slash(self):
-        """Test name extraction handles folder-like keys."""
-        obj = S3Object(
-            key="folder/subfolder/",
-            size=0,
-            last_modified=datetime.now(),
-            etag="abc123",
-        )
-        assert obj.name == "subfolder"
+    @pytest.mark.parametrize(
+        ("key", "expected"),
+        [
+            ("folder/subfolder/file.txt", "file.txt"),
+            ("folder/subfolder/", "subfolder"),
+            ("readme.txt", "readme.txt"),
+            ("a/b/c/d/e/file.txt", "file.txt"),
+        ],
+    )
+    def test_name(self, key, expected):
+        """Test extracting name from key, including folder-like and root-level keys."""
+        obj = S3Object(key=key, size=0, last_modified=_NOW, etag="abc123")
+        assert obj.name == expected
 
     def test_is_folder(self):
         """Test folder detection."""
-        folder = S3Object(
-            key="folder/",
-            size=0,
-            last_modified=datetime.now(),
-            etag="abc123",
-        )
-        file = S3Object(
-            key="file.txt",
-            size=100,
-            last_modified=datetime.now(),
-            etag="abc123",
-        )
-        assert folder.is_folder is True
-        assert file.is_folder is False
+        assert _FOLDER_OBJ.is_folder is True
+        assert _FILE_OBJ.is_folder is False
 
 
 class TestAsyncOperation:
@@ -75,12 +162,57 @@ class TestAsyncOperation:
         op.cancel()
         assert op.is_cancelled is True
 
+    def test_wait_without_worker(self):
+        """Test wait returns immediately for an operation that was never submitted."""
+        op = AsyncOperation(id="test-1", description="Test")
+        assert op.wait(timeout=0) is True
+
+
+class TestTransferCallback:
+    """Tests for the throttled transfer progress callback."""
+
+    def test_tracks_bytes_and_throttles_progress(self):
+        """Test every chunk is counted but on_progress fires at a limited rate."""
+        op = AsyncOperation(id="test-1", description="Test")
+        updates = []
+        callback = _make_transfer_callback(op, 1000, updates.append, "Download")
+
+        for _ in range(99):
+            callback(10)
+
+        assert op.completed_items == 990
+        assert 1 <= len(updates) < 99
+
+        callback(10)
+        assert op.completed_items == 1000
+        assert op.progress == 1.0
+        assert updates[-1] is op
+
+    def test_final_chunk_always_reported(self):
+        """Test the completing chunk is reported even inside the throttle window."""
+        op = AsyncOperation(id="test-1", description="Test")
+        updates = []
+        callback = _make_transfer_callback(op, 20, lambda o: updates.append(o.completed_items), "Upload")
+
+        callback(10)
+        callback(10)
+
+        assert updates == [10, 20]
+
+    def test_cancel_raises_interrupted(self):
+        """Test a cancelled operation aborts the transfer."""
+        op = AsyncOperation(id="test-1", description="Test")
+        callback = _make_transfer_callback(op, 100, None, "Upload")
+        op.cancel()
+
+        with pytest.raises(InterruptedError):
+            callback(10)
+
 
 class TestS3Client:
     """Tests for S3Client."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_client_initialization(self, mock_boto_client):
+    def test_client_initialization(self, fake_boto_client):
         """Test client initializes boto3 correctly."""
         client = S3Client(
             endpoint_url="https://example.com",
@@ -89,8 +221,8 @@ class TestS3Client:
             region="us-east-1",
         )
 
-        mock_boto_client.assert_called_once()
-        call_kwargs = mock_boto_client.call_args[1]
+        fake_boto_client.assert_called_once()
+        call_kwargs = fake_boto_client.call_args[1]
         assert call_kwargs["endpoint_url"] == "https://example.com"
         assert call_kwargs["aws_access_key_id"] == "access"
         assert call_kwargs["aws_secret_access_key"] == "secret"
@@ -98,47 +230,78 @@ class TestS3Client:
 
         client.close()
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_test_connection_success(self, mock_boto_client):
-        """Test successful connection test."""
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.return_value = {"Buckets": []}
-        mock_boto_client.return_value = mock_s3
+    def test_max_workers_sizes_pool(self, fake_boto_client):
+        """Test max_workers sets the thread pool and HTTP connection pool size."""
+        client = S3Client(
+            endpoint_url="https://example.com",
+            access_key="access",
+            secret_key="secret",
+            max_workers=16,
+        )
 
+        assert client._executor._max_workers == 16
+        assert fake_boto_client.call_args[1]["config"].max_pool_connections == 16
+        client.close()
+
+    def test_shared_executor_survives_close(self, fake_boto_client):
+        """Test a caller-supplied executor is used and not shut down by close()."""
+        pool = ThreadPoolExecutor(max_workers=1)
         client = S3Client(
             endpoint_url="https://example.com",
             access_key="access",
             secret_key="secret",
+            executor=pool,
         )
 
-        assert client.test_connection() is True
-        mock_s3.list_buckets.assert_called_once()
+        assert client._executor is pool
         client.close()
+        assert pool.submit(lambda: 42).result(timeout=5) == 42
+        pool.shutdown()
+
+    def test_default_pool_size_bounds(self, monkeypatch):
+        """Test the default pool size is clamped to a safe range."""
+        monkeypatch.delenv("LOLRUS_S3_POOL", raising=False)
+
+        monkeypatch.setattr("lolrus.s3_client.os.cpu_count", lambda: 1)
+        assert _default_pool_size() == 4
+
+        monkeypatch.setattr("lolrus.s3_client.os.cpu_count", lambda: 8)
+        assert _default_pool_size() == 16
+
+        monkeypatch.setattr("lolrus.s3_client.os.cpu_count", lambda: 224)
+        assert _default_pool_size() == 32
+
+    def test_default_pool_size_env_override(self, monkeypatch):
+        """Test LOLRUS_S3_POOL overrides the computed size, ignoring bad values."""
+        monkeypatch.setattr("lolrus.s3_client.os.cpu_count", lambda: 8)
+
+        monkeypatch.setenv("LOLRUS_S3_POOL", "64")
+        assert _default_pool_size() == 64
+
+        monkeypatch.setenv("LOLRUS_S3_POOL", "lots")
+        assert _default_pool_size() == 16
+
+    def test_test_connection_success(self, client, fake_s3):
+        """Test successful connection test."""
+        fake_s3.list_buckets.return_value = {"Buckets": []}
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_list_buckets(self, mock_boto_client):
+        assert client.test_connection() is True
+        fake_s3.list_buckets.assert_called_once()
+
+    def test_list_buckets(self, client, fake_s3):
         """Test listing buckets."""
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.return_value = {
+        fake_s3.list_buckets.return_value = {
             "Buckets": [
                 {"Name": "bucket1", "CreationDate": datetime(2024, 1, 1)},
                 {"Name": "bucket2", "CreationDate": datetime(2024, 1, 2)},
             ]
         }
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
 
         buckets = client.list_buckets()
 
         assert len(buckets) == 2
         assert buckets[0].name == "bucket1"
         assert buckets[1].name == "bucket2"
-        client.close()
 
 
 class TestConnectionManager:
@@ -146,8 +309,6 @@ class TestConnectionManager:
 
     def test_connection_to_dict(self):
         """Test connection serialization excludes secrets."""
-        from lolrus.connections import Connection
-
         conn = Connection(
             name="test",
             endpoint_url="https://example.com",
@@ -166,8 +327,6 @@ class TestConnectionManager:
 
     def test_connection_from_dict(self):
         """Test connection deserialization."""
-        from lolrus.connections import Connection
-
         data = {
             "name": "test",
             "endpoint_url": "https://example.com",
@@ -186,158 +345,145 @@ class TestConnectionManager:
 class TestS3ClientListObjects:
     """Tests for S3Client.list_objects method."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_list_objects_returns_objects_and_prefixes(self, mock_boto_client):
-        """Test listing objects returns both objects and folder prefixes."""
-        mock_s3 = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {
-                        "Key": "file1.txt",
-                        "Size": 100,
-                        "LastModified": datetime(2024, 1, 1),
-                        "ETag": '"abc123"',
-                        "StorageClass": "STANDARD",
-                    },
-                    {
-                        "Key": "file2.txt",
-                        "Size": 200,
-                        "LastModified": datetime(2024, 1, 2),
-                        "ETag": '"def456"',
-                    },
-                ],
-                "CommonPrefixes": [
-                    {"Prefix": "folder1/"},
-                    {"Prefix": "folder2/"},
-                ],
-            }
-        ]
-        mock_s3.get_paginator.return_value = mock_paginator
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        objects, prefixes = client.list_objects("test-bucket")
-
-        assert len(objects) == 2
-        assert objects[0].key == "file1.txt"
-        assert objects[0].size == 100
-        assert objects[1].key == "file2.txt"
-        assert len(prefixes) == 2
-        assert "folder1/" in prefixes
-        assert "folder2/" in prefixes
-        client.close()
-
-    @patch("lolrus.s3_client.boto3.client")
-    def test_list_objects_with_prefix(self, mock_boto_client):
-        """Test listing objects with prefix filter."""
-        mock_s3 = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {
-                        "Key": "folder/file.txt",
-                        "Size": 100,
-                        "LastModified": datetime(2024, 1, 1),
-                        "ETag": '"abc123"',
-                    },
-                ],
-                "CommonPrefixes": [],
-            }
-        ]
-        mock_s3.get_paginator.return_value = mock_paginator
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        objects, prefixes = client.list_objects("test-bucket", prefix="folder/")
-
-        mock_paginator.paginate.assert_called_with(
-            Bucket="test-bucket", Prefix="folder/", Delimiter="/"
-        )
-        assert len(objects) == 1
-        assert objects[0].key == "folder/file.txt"
-        client.close()
-
-    @patch("lolrus.s3_client.boto3.client")
-    def test_list_objects_empty_bucket(self, mock_boto_client):
-        """Test listing objects in an empty bucket."""
-        mock_s3 = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [{}]  # No Contents or CommonPrefixes
-        mock_s3.get_paginator.return_value = mock_paginator
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        objects, prefixes = client.list_objects("empty-bucket")
-
-        assert len(objects) == 0
-        assert len(prefixes) == 0
-        client.close()
-
-    @patch("lolrus.s3_client.boto3.client")
-    def test_list_objects_skips_prefix_itself(self, mock_boto_client):
-        """Test that listing objects skips the prefix key itself."""
-        mock_s3 = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {
-                        "Key": "folder/",  # The prefix itself
-                        "Size": 0,
-                        "LastModified": datetime(2024, 1, 1),
-                        "ETag": '"abc"',
-                    },
-                    {
-                        "Key": "folder/file.txt",
-                        "Size": 100,
-                        "LastModified": datetime(2024, 1, 1),
-                        "ETag": '"def"',
-                    },
-                ],
-            }
-        ]
-        mock_s3.get_paginator.return_value = mock_paginator
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        objects, prefixes = client.list_objects("bucket", prefix="folder/")
-
-        assert len(objects) == 1
-        assert objects[0].key == "folder/file.txt"
-        client.close()
+    @pytest.mark.parametrize(
+        ("pages", "prefix", "expected_objects", "expected_prefixes"),
+        [
+            pytest.param(
+                _PAGE_TWO_FILES_TWO_PREFIXES,
+                "",
+                (("file1.txt", 100), ("file2.txt", 200)),
+                frozenset(("folder1/", "folder2/")),
+                id="objects-and-prefixes",
+            ),
+            pytest.param(
+                _PAGE_ONE_FILE_IN_FOLDER,
+                "folder/",
+                (("folder/file.txt", 100),),
+                frozenset(),
+                id="with-prefix",
+            ),
+            pytest.param(_PAGE_EMPTY, "", (), frozenset(), id="empty-bucket"),
+            pytest.param(
+                _PAGE_FOLDER_MARKER_AND_FILE,
+                "folder/",
+                (("folder/file.txt", 100),),
+                frozenset(),
+                id="skips-prefix-itself",
+            ),
+            pytest.param(
+                _TWO_FULL_PAGES,
+                "",
+                tuple((obj["Key"], obj["Size"]) for page in _TWO_FULL_PAGES for obj in page["Contents"]),
+                frozenset(),
+                id="multi-page",
+            ),
+        ],
+    )
+    def test_list_objects(self, stubbed_client, s3_stubber, pages, prefix, expected_objects, expected_prefixes):
+        """Test list_objects flattens pages into objects and folder prefixes."""
+        token = None
+        for page in pages:
+            expected_params = {"Bucket": "test-bucket", "Prefix": prefix, "Delimiter": "/", "FetchOwner": False, "MaxKeys": 1000}
+            if token:
+                expected_params["ContinuationToken"] = token
+            s3_stubber.add_response("list_objects_v2", page, expected_params)
+            token = page.get("NextContinuationToken")
+
+        objects, prefixes = stubbed_client.list_objects("test-bucket", prefix=prefix)
+
+        assert tuple((o.key, o.size) for o in objects) == expected_objects
+        assert len(prefixes) == len(expected_prefixes)
+        assert set(prefixes) == expected_prefixes
+
+    def test_list_objects_100k(self, client, fake_s3):
+        """Test a 100k-object listing builds compact S3Object instances."""
+        page = {
+            "Contents": [
+                {
+                    "Key": f"folder/file{i:04d}.txt",
+                    "Size": i,
+                    "LastModified": _NOW,
+                    "ETag": '"d41d8cd98f00b204e9800998ecf8427e"',
+                }
+                for i in range(1000)
+            ],
+        }
+        fake_s3.get_paginator.return_value.paginate.return_value = (page,) * 100
+
+        objects, _ = client.list_objects("bucket")
+
+        assert len(objects) == 100_000
+        # Slots keep a per-instance __dict__ off every listed object
+        assert not hasattr(objects[0], "__dict__")
+
+    def test_list_objects_parallel(self, client, fake_s3):
+        """Test each prefix is listed separately and results keep the input order."""
+        prefixes = tuple(f"folder{i}/" for i in range(20))
+
+        def pages(Prefix, **kwargs):
+            return (
+                {
+                    "Contents": [
+                        {
+                            "Key": f"{Prefix}file.txt",
+                            "Size": 100,
+                            "LastModified": _NOW,
+                            "ETag": '"abc"',
+                        },
+                    ],
+                    "CommonPrefixes": [{"Prefix": f"{Prefix}sub/"}],
+                },
+            )
+
+        fake_s3.get_paginator.return_value.paginate.side_effect = pages
+
+        results = client.list_objects_parallel("bucket", prefixes, max_workers=8)
+
+        assert len(results) == len(prefixes)
+        for prefix, (objects, sub_prefixes) in zip(prefixes, results, strict=True):
+            assert [o.key for o in objects] == [f"{prefix}file.txt"]
+            assert sub_prefixes == [f"{prefix}sub/"]
+
+    def test_list_objects_parallel_no_prefixes(self, client, fake_s3):
+        """Test an empty prefix list returns without listing anything."""
+        assert client.list_objects_parallel("bucket", ()) == []
+        fake_s3.get_paginator.return_value.paginate.assert_not_called()
+
+    def test_iter_object_pages_is_lazy(self, client, fake_s3):
+        """Test pages are only fetched as the iterator is consumed."""
+        fetched = []
+
+        def pages(**kwargs):
+            for i in range(3):
+                fetched.append(i)
+                yield {
+                    "Contents": [
+                        {
+                            "Key": f"file{i}.txt",
+                            "Size": 100,
+                            "LastModified": datetime(2024, 1, 1),
+                            "ETag": '"abc"',
+                        },
+                    ],
+                    "CommonPrefixes": [{"Prefix": f"folder{i}/"}],
+                }
+
+        fake_s3.get_paginator.return_value.paginate.side_effect = pages
+
+        first = list(islice(client.iter_object_pages("bucket"), 1))
+
+        assert fetched == [0]
+        objects, prefixes = first[0]
+        assert [o.key for o in objects] == ["file0.txt"]
+        assert prefixes == ["folder0/"]
 
 
 class TestS3ClientGetObjectInfo:
     """Tests for S3Client.get_object_info method."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_get_object_info_returns_metadata(self, mock_boto_client):
+    def test_get_object_info_returns_metadata(self, client, fake_s3):
         """Test get_object_info returns correct metadata."""
-        mock_s3 = MagicMock()
-        mock_s3.head_object.return_value = {
+        fake_s3.head_object.return_value = {
             "ContentType": "text/plain",
             "ContentLength": 1234,
             "LastModified": datetime(2024, 1, 1),
@@ -345,13 +491,6 @@ class TestS3ClientGetObjectInfo:
             "Metadata": {"custom": "value"},
             "StorageClass": "STANDARD",
         }
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
 
         info = client.get_object_info("bucket", "file.txt")
 
@@ -360,67 +499,51 @@ class TestS3ClientGetObjectInfo:
         assert info["etag"] == "abc123"
         assert info["metadata"] == {"custom": "value"}
         assert info["storage_class"] == "STANDARD"
-        mock_s3.head_object.assert_called_once_with(Bucket="bucket", Key="file.txt")
-        client.close()
+        fake_s3.head_object.assert_called_once_with(Bucket="bucket", Key="file.txt")
+
+    def test_get_object_info_unquoted_etag(self, client, fake_s3):
+        """Test an ETag without surrounding quotes is returned unchanged."""
+        fake_s3.head_object.return_value = {"ETag": "abc123"}
+
+        info = client.get_object_info("bucket", "file.txt")
+
+        assert info["etag"] == "abc123"
 
 
 class TestS3ClientDownloadToMemory:
     """Tests for S3Client.download_object_to_memory method."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_download_object_to_memory_success(self, mock_boto_client):
+    def test_download_object_to_memory_success(self, client, fake_s3):
         """Test downloading small object to memory."""
-        mock_s3 = MagicMock()
-        mock_s3.head_object.return_value = {"ContentLength": 100}
-        mock_body = MagicMock()
+        fake_s3.head_object.return_value = {"ContentLength": 12}
+        mock_body = Mock(spec_set=("read",))
         mock_body.read.return_value = b"test content"
-        mock_s3.get_object.return_value = {"Body": mock_body}
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
+        fake_s3.get_object.return_value = {"Body": mock_body}
 
         data = client.download_object_to_memory("bucket", "file.txt")
 
+        # bytes, not bytearray: previews wrap this in io.BytesIO, which copies a bytearray
+        assert type(data) is bytes
         assert data == b"test content"
-        mock_s3.get_object.assert_called_once_with(Bucket="bucket", Key="file.txt")
-        client.close()
+        fake_s3.get_object.assert_called_once_with(Bucket="bucket", Key="file.txt")
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_download_object_to_memory_too_large(self, mock_boto_client):
+    def test_download_object_to_memory_too_large(self, client, fake_s3):
         """Test downloading object that exceeds max size raises error."""
-        mock_s3 = MagicMock()
-        mock_s3.head_object.return_value = {"ContentLength": 100_000_000}  # 100MB
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
+        fake_s3.head_object.return_value = {"ContentLength": 100_000_000}  # 100MB
 
-        with pytest.raises(ValueError) as exc_info:
+        with pytest.raises(ValueError, match=_TOO_LARGE_RE):
             client.download_object_to_memory("bucket", "large-file.bin")
 
-        assert "too large for preview" in str(exc_info.value)
-        client.close()
-
 
 class TestS3ClientConnectionFailure:
     """Tests for connection failure scenarios."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_test_connection_failure(self, mock_boto_client):
+    def test_test_connection_failure(self, fake_s3):
         """Test connection failure returns False."""
-        mock_s3 = MagicMock()
-        mock_s3.list_buckets.side_effect = ClientError(
+        fake_s3.list_buckets.side_effect = ClientError(
             {"Error": {"Code": "InvalidAccessKeyId", "Message": "Invalid"}},
             "ListBuckets"
         )
-        mock_boto_client.return_value = mock_s3
 
         client = S3Client(
             endpoint_url="https://example.com",
@@ -435,127 +558,164 @@ class TestS3ClientConnectionFailure:
 class TestS3ClientAsyncOperations:
     """Tests for async operations."""
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_delete_objects_async_calls_callback(self, mock_boto_client):
+    def test_delete_objects_async_calls_callback(self, client, fake_s3):
         """Test delete_objects_async calls completion callback."""
-        mock_s3 = MagicMock()
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        completed = threading.Event()
-        result_op = None
-
-        def on_complete(op):
-            nonlocal result_op
-            result_op = op
-            completed.set()
+        completed = queue.SimpleQueue()
 
         op = client.delete_objects_async(
             "bucket",
-            ["key1", "key2"],
-            on_complete=on_complete,
+            ("key1", "key2"),
+            on_complete=completed.put,
         )
 
         # Note: We don't check op.status == PENDING here because
         # the operation may complete before we can check (race condition)
         assert op.total_items == 2
 
-        # Wait for completion
-        completed.wait(timeout=5)
+        result_op = completed.get(timeout=5)
 
-        assert result_op is not None
-        assert result_op.status == OperationStatus.COMPLETED
-        mock_s3.delete_objects.assert_called_once()
-        client.close()
+        assert result_op is op
+        assert (op.status, op.progress, op.completed_items) == (OperationStatus.COMPLETED, 1.0, 2)
+        fake_s3.delete_objects.assert_called_once()
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_async_operation_progress_tracking(self, mock_boto_client):
+    def test_async_operation_progress_tracking(self, client):
         """Test async operations track progress correctly."""
-        mock_s3 = MagicMock()
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
         progress_updates = []
-        completed = threading.Event()
 
         def on_progress(op):
             progress_updates.append(op.progress)
 
-        def on_complete(op):
-            completed.set()
-
-        keys = [f"key{i}" for i in range(10)]
         op = client.delete_objects_async(
             "bucket",
-            keys,
+            _TEN_KEYS,
             on_progress=on_progress,
-            on_complete=on_complete,
         )
 
-        completed.wait(timeout=5)
+        assert op.wait(timeout=5)
+
+        assert (op.status, op.progress, op.completed_items) == (OperationStatus.COMPLETED, 1.0, 10)
+
+    def test_delete_objects_async_batches_requests(self, client, fake_s3):
+        """Test delete_objects_async splits keys into 1000-key requests."""
+        keys = [f"key{i}" for i in range(2500)]
+        op = client.delete_objects_async("bucket", keys)
+        assert op.wait(timeout=5)
 
         assert op.status == OperationStatus.COMPLETED
-        assert op.progress == 1.0
-        assert op.completed_items == 10
-        client.close()
+        assert op.completed_items == 2500
+        batch_sizes = [len(c.kwargs["Delete"]["Objects"]) for c in fake_s3.delete_objects.call_args_list]
+        assert batch_sizes == [1000, 1000, 500]
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_async_operation_cancellation(self, mock_boto_client):
-        """Test async operation can be cancelled."""
-        mock_s3 = MagicMock()
-        mock_boto_client.return_value = mock_s3
+    def test_download_object_async_writes_file(self, client, fake_s3, tmp_path):
+        """Test download_object_async streams the body to disk."""
+        mock_body = Mock(spec_set=("iter_chunks", "close"))
+        mock_body.iter_chunks.return_value = [b"hello ", b"world"]
+        fake_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 11}
 
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
+        local_path = tmp_path / "file.txt"
+        op = client.download_object_async("bucket", "file.txt", str(local_path))
+        assert op.wait(timeout=5)
+
+        assert op.status == OperationStatus.COMPLETED
+        assert local_path.read_bytes() == b"hello world"
+        mock_body.close.assert_called_once()
+
+    def test_download_object_async_cancel_removes_partial_file(self, client, fake_s3, tmp_path):
+        """Test cancelling a download closes the body and deletes the partial file."""
+        mock_body = Mock(spec_set=("iter_chunks", "close"))
+        mock_body.iter_chunks.return_value = [b"hello ", b"world"]
+        fake_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 11}
+
+        local_path = tmp_path / "file.txt"
+        op = client.download_object_async(
+            "bucket",
+            "file.txt",
+            str(local_path),
+            on_progress=lambda op: op.cancel(),
         )
+        assert op.wait(timeout=5)
+
+        assert op.status == OperationStatus.CANCELLED
+        assert not local_path.exists()
+        mock_body.close.assert_called_once()
+
+    def test_download_object_async_failure_keeps_existing_file(self, client, fake_s3, tmp_path):
+        """Test a failed request leaves a file already at the destination untouched."""
+        fake_s3.get_object.side_effect = ClientError({"Error": {"Code": "AccessDenied", "Message": "Denied"}}, "GetObject")
+        local_path = tmp_path / "report.pdf"
+        local_path.write_bytes(b"original")
+
+        op = client.download_object_async("bucket", "report.pdf", str(local_path))
+        assert op.wait(timeout=5)
+
+        assert op.status == OperationStatus.FAILED
+        assert local_path.read_bytes() == b"original"
+
+    def test_download_object_async_streaming_error_fails(self, client, fake_s3, tmp_path):
+        """Test an error while reading the body fails the op and keeps the existing file."""
+
+        def chunks(chunk_size):
+            yield b"hello "
+            raise ResponseStreamingError(error="connection reset")
+
+        mock_body = Mock(spec_set=("iter_chunks", "close"))
+        mock_body.iter_chunks.side_effect = chunks
+        fake_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 11}
+        completed = queue.SimpleQueue()
+        local_path = tmp_path / "file.txt"
+        local_path.write_bytes(b"original")
 
+        op = client.download_object_async("bucket", "file.txt", str(local_path), on_complete=completed.put)
+
+        assert completed.get(timeout=5) is op
+        assert op.status == OperationStatus.FAILED
+        assert local_path.read_bytes() == b"original"
+        assert list(tmp_path.iterdir()) == [local_path]
+        mock_body.close.assert_called_once()
+
+    def test_download_object_async_late_cancel_is_cancelled(self, client, fake_s3, tmp_path, monkeypatch):
+        """Test a cancel landing after the loop's check reports CANCELLED, not FAILED."""
+
+        def cancelling_callback(op, total_size, on_progress, action):
+            callback = _make_transfer_callback(op, total_size, on_progress, action)
+
+            def cancel_then_report(bytes_transferred):
+                op.cancel()
+                callback(bytes_transferred)
+
+            return cancel_then_report
+
+        monkeypatch.setattr("lolrus.s3_client._make_transfer_callback", cancelling_callback)
+        mock_body = Mock(spec_set=("iter_chunks", "close"))
+        mock_body.iter_chunks.return_value = [b"hello ", b"world"]
+        fake_s3.get_object.return_value = {"Body": mock_body, "ContentLength": 11}
+        local_path = tmp_path / "file.txt"
+        local_path.write_bytes(b"original")
+
+        op = client.download_object_async("bucket", "file.txt", str(local_path))
+        assert op.wait(timeout=5)
+
+        assert op.status == OperationStatus.CANCELLED
+        assert local_path.read_bytes() == b"original"
+        assert list(tmp_path.iterdir()) == [local_path]
+
+    def test_async_operation_cancellation(self, client):
+        """Test async operation can be cancelled."""
         op = AsyncOperation(id="test", description="Test op")
         op.cancel()
         assert op.is_cancelled is True
-        client.close()
 
-    @patch("lolrus.s3_client.boto3.client")
-    def test_empty_bucket_async_empty_bucket(self, mock_boto_client):
+    def test_empty_bucket_async_empty_bucket(self, client, fake_s3):
         """Test emptying an already empty bucket."""
-        mock_s3 = MagicMock()
-        mock_paginator = MagicMock()
-        mock_paginator.paginate.return_value = [{}]  # No objects
-        mock_s3.get_paginator.return_value = mock_paginator
-        mock_boto_client.return_value = mock_s3
-
-        client = S3Client(
-            endpoint_url="https://example.com",
-            access_key="access",
-            secret_key="secret",
-        )
-
-        completed = threading.Event()
-        result_op = None
+        mock_paginator = fake_s3.get_paginator.return_value
+        mock_paginator.paginate.return_value = _PAGE_EMPTY
 
-        def on_complete(op):
-            nonlocal result_op
-            result_op = op
-            completed.set()
+        op = client.empty_bucket_async("empty-bucket")
+        assert op.wait(timeout=5)
 
-        client.empty_bucket_async("empty-bucket", on_complete=on_complete)
-        completed.wait(timeout=5)
-
-        assert result_op.status == OperationStatus.COMPLETED
-        assert result_op.total_items == 0
-        mock_s3.delete_objects.assert_not_called()
-        client.close()
+        assert op.status == OperationStatus.COMPLETED
+        assert op.total_items == 0
+        fake_s3.delete_objects.assert_not_called()
 
 
 class TestS3ObjectAdditional:
@@ -563,33 +723,7 @@ class TestS3ObjectAdditional:
 
     def test_storage_class_default(self):
         """Test storage class defaults to STANDARD."""
-        obj = S3Object(
-            key="file.txt",
-            size=100,
-            last_modified=datetime.now(),
-            etag="abc",
-        )
-        assert obj.storage_class == "STANDARD"
-
-    def test_root_level_file_name(self):
-        """Test name extraction for root-level file."""
-        obj = S3Object(
-            key="readme.txt",
-            size=100,
-            last_modified=datetime.now(),
-            etag="abc",
-        )
-        assert obj.name == "readme.txt"
-
-    def test_deeply_nested_file_name(self):
-        """Test name extraction for deeply nested file."""
-        obj = S3Object(
-            key="a/b/c/d/e/file.txt",
-            size=100,
-            last_modified=datetime.now(),
-            etag="abc",
-        )
-        assert obj.name == "file.txt"
+        assert _FILE_OBJ.storage_class == "STANDARD"
 
 
 class TestS3BucketDataclass: